@@ -9,6 +9,9 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     SECRET_KEY: str = "your-secret-key-here"
     
+    # Admin (header X-Admin-Key); vazio desabilita endpoints administrativos
+    ADMIN_API_KEY: str = ""
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -34,5 +37,27 @@ class Settings(BaseSettings):
     # Upload settings
     MAX_FILE_SIZE_MB: int = 10
     ALLOWED_FILE_TYPES: List[str] = [".csv", ".xlsx"]
+    MAX_DECOMPRESSED_SIZE_MB: int = 500
+    MAX_COMPRESSION_RATIO: int = 100
+    
+    # Profiling da análise
+    PROFILING_STORAGE_DIR: str = "data/profiles"
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_SLOW_THRESHOLD_MS: int = 2000
+    PROFILING_MAX_STORED: int = 200
+    
+    # Detecção de cópia de operações entre contas
+    COPY_TRADE_INDEX_PATH: str = "data/copy_trade_index.sqlite3"
+    COPY_TRADE_TIME_BUCKET_SECONDS: int = 60
+    COPY_TRADE_RETENTION_DAYS: int = 90
+    COPY_TRADE_SIMILARITY_THRESHOLD: float = 0.5
+    COPY_TRADE_MIN_MATCHES: int = 5
+    
+    # Arquivo colunar de uploads (Arrow IPC); "uncompressed" permite leitura zero-copy
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_DIR: str = "data/archive"
+    ARCHIVE_COMPRESSION: str = "lz4"
+    ARCHIVE_ANONYMOUS_MAX_STORED: int = 500
+    ARCHIVE_MAX_PENDING_WRITES: int = 4
 
 settings = Settings() 
\ No newline at end of file
@@ -0,0 +1,18 @@
+from fastapi import Header, HTTPException
+from typing import Optional
+import hmac
+from .config import settings
+
+def is_admin(admin_key: Optional[str]) -> bool:
+    """Verifica se a chave informada corresponde à ADMIN_API_KEY configurada"""
+    if not settings.ADMIN_API_KEY or not admin_key:
+        return False
+    return hmac.compare_digest(admin_key, settings.ADMIN_API_KEY)
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Dependency para endpoints administrativos"""
+    if not is_admin(x_admin_key):
+        raise HTTPException(
+            status_code=403,
+            detail="Acesso restrito a administradores"
+        )
@@ -5,7 +5,7 @@ import uvicorn
 import os
 from dotenv import load_dotenv
 import structlog
-from .routers import ylos_analysis, health
+from .routers import ylos_analysis, health, profiles
 from .core.config import settings
 from .core.logging import setup_logging
 
@@ -35,6 +35,7 @@ app.add_middleware(
 # Incluir routers
 app.include_router(health.router, prefix="/api/health", tags=["health"])
 app.include_router(ylos_analysis.router, prefix="/api/ylos", tags=["ylos"])
+app.include_router(profiles.router, prefix="/api/profiles", tags=["profiling"])
 
 @app.on_event("startup")
 async def startup_event():
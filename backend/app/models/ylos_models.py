@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 from enum import Enum
 from datetime import datetime
+import re
 
 class ContaType(str, Enum):
     MASTER_FUNDED = "master_funded"
@@ -14,6 +15,7 @@ class YlosAnalysisRequest(BaseModel):
     fuso_horario: str = Field(..., description="Fuso horário das operações (ex: -03, -04, -05)")
     verificar_noticias: bool = Field(default=False, description="Verificar conformidade com eventos noticiosos")
     num_saques_realizados: int = Field(..., ge=0, description="Número de saques já realizados")
+    conta_id: Optional[str] = Field(None, description="Identificador da conta (habilita detecção de cópia entre contas)")
     
     @validator('fuso_horario')
     def validate_timezone(cls, v):
@@ -21,6 +23,12 @@ class YlosAnalysisRequest(BaseModel):
         if v not in allowed_timezones:
             raise ValueError(f'Fuso horário deve ser um de: {allowed_timezones}')
         return v
+    
+    @validator('conta_id')
+    def validate_conta_id(cls, v):
+        if v is not None and not re.fullmatch(r'[A-Za-z0-9_-]{1,64}', v):
+            raise ValueError('conta_id deve ter até 64 caracteres: letras, números, "_" ou "-"')
+        return v
 
 class OperacaoCSV(BaseModel):
     """Modelo para uma operação individual do CSV"""
@@ -60,11 +68,22 @@ class YlosAnalysisResponse(BaseModel):
     lucro_total: float = Field(..., description="Lucro total das operações")
     maior_lucro_dia: float = Field(..., description="Maior lucro em um único dia")
     consistencia_40_percent: bool = Field(..., description="Se passa na regra dos 40%")
+    saldo_inicial_estimado: Optional[float] = Field(None, description="Saldo antes da primeira operação (saldo atual - resultado acumulado)")
+    drawdown_maximo: Optional[float] = Field(None, description="Maior drawdown trailing da curva de saldo")
+    exposicao_maxima: Optional[Dict[str, Any]] = Field(None, description="Pico de contratos simultâneos por ativo e por dia")
+    estatisticas_tempo_operacao: Optional[Dict[str, Any]] = Field(None, description="Estatísticas de tempo de operação e scalping por ativo")
+    contas_similares: Optional[List[Dict[str, Any]]] = Field(None, description="Contas com operações coincidentes e score de similaridade")
+    cobertura_deteccao_copia: Optional[Dict[str, Any]] = Field(None, description="Operações comparadas e fora da janela do índice de cópia")
     violacoes: List[ViolacaoRegra] = Field(default_factory=list)
     detalhes_noticias: Optional[List[Dict[str, Any]]] = Field(None)
     recomendacoes: List[str] = Field(default_factory=list)
     proximos_passos: List[str] = Field(default_factory=list)
     
+class ArchiveBulkReanalysisRequest(BaseModel):
+    """Modelo para reanálise em massa do arquivo com regras alteradas"""
+    regras: Dict[str, Any] = Field(..., description="Valores de regras a sobrescrever (ex: {'consistencia_max_percent': 35})")
+    conta_type: Optional[ContaType] = Field(None, description="Aplicar apenas a uploads deste tipo de conta")
+
 class HealthCheck(BaseModel):
     """Modelo para health check"""
     status: str = "OK"
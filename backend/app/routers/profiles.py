@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse
+import json
+import structlog
+from ..core.security import require_admin
+from ..services import profiling
+
+logger = structlog.get_logger(__name__)
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+def _profile_dir_or_404(profile_id: str):
+    profile_dir = profiling.get_profile_dir(profile_id)
+    if profile_dir is None:
+        raise HTTPException(status_code=404, detail="Profile não encontrado")
+    return profile_dir
+
+@router.get("/")
+async def list_profiles():
+    """Lista os profiles capturados da análise (admin)"""
+    profiles = profiling.list_profiles()
+    return {"total": len(profiles), "profiles": profiles}
+
+@router.get("/{profile_id}")
+async def get_profile_metadata(profile_id: str):
+    """Retorna metadados, etapas e funções mais custosas de um profile (admin)"""
+    profile_dir = _profile_dir_or_404(profile_id)
+    with open(profile_dir / profiling.METADATA_FILENAME, encoding='utf-8') as f:
+        return json.load(f)
+
+@router.get("/{profile_id}/download")
+async def download_profile(profile_id: str):
+    """
+    Download do arquivo cProfile (.prof), compatível com pstats/snakeviz (admin)
+    """
+    profile_dir = _profile_dir_or_404(profile_id)
+    return FileResponse(
+        profile_dir / profiling.PROFILE_FILENAME,
+        media_type="application/octet-stream",
+        filename=f"{profile_id}.prof"
+    )
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends, Header, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
+import asyncio
 import structlog
 from typing import Optional
 from ..services.ylos_analyzer import YlosTradeAnalyzer
-from ..models.ylos_models import YlosAnalysisRequest, YlosAnalysisResponse, ContaType
+from ..models.ylos_models import (
+    YlosAnalysisRequest,
+    YlosAnalysisResponse,
+    ContaType,
+    ArchiveBulkReanalysisRequest
+)
 from ..core.config import settings
+from ..core.security import is_admin, require_admin
+from ..services import profiling
+from ..services.upload_stream import UploadStream, ACCEPTED_EXTENSIONS, upload_size
+from ..services.copy_trading import CopyTradeIndex
+from ..services.trade_archive import TradeArchive, ANONYMOUS_ACCOUNT
 import os
 
 logger = structlog.get_logger(__name__)
@@ -16,25 +28,38 @@ def get_analyzer() -> YlosTradeAnalyzer:
 
 @router.post("/analyze", response_model=YlosAnalysisResponse)
 async def analyze_trading_report(
-    csv_file: UploadFile = File(..., description="Arquivo CSV com relatório de operações"),
+    response: Response,
+    csv_file: UploadFile = File(..., description="Arquivo CSV com relatório de operações (opcionalmente gzip ou zstd)"),
     conta_type: int = Form(..., description="Tipo da conta: 1=Master Funded, 2=Instant Funding"),
     saldo_atual: float = Form(..., description="Saldo atual em USD"),
     fuso_horario: str = Form(..., description="Fuso horário das operações (ex: -03, -04, -05)"),
     verificar_noticias: bool = Form(False, description="Verificar conformidade com eventos noticiosos"),
     num_saques_realizados: int = Form(..., description="Número de saques já realizados"),
+    conta_id: Optional[str] = Form(None, description="Identificador da conta (detecção de cópia entre contas)"),
+    profile: bool = Form(False, description="(Admin) Capturar profiling desta análise"),
+    x_admin_key: Optional[str] = Header(None),
     analyzer: YlosTradeAnalyzer = Depends(get_analyzer)
 ):
     """
     Analisa relatório CSV de operações conforme regras YLOS Trading
     
-    - **csv_file**: Arquivo CSV com as operações
+    - **csv_file**: Arquivo CSV com as operações, aceito também compactado com gzip ou zstd
     - **conta_type**: 1 para Master Funded, 2 para Instant Funding
     - **saldo_atual**: Saldo atual da conta em USD
     - **fuso_horario**: Fuso horário das operações (-03, -04, -05, etc.)
     - **verificar_noticias**: Se deve verificar posicionamento durante notícias
     - **num_saques_realizados**: Quantos saques já foram feitos
+    - **conta_id**: Identificador da conta; habilita a detecção de cópia de operações entre contas
+      (ids e similaridade de outras contas só são retornados a administradores)
+    - **profile**: Captura cProfile e alocações da análise (requer header X-Admin-Key)
     """
     
+    if profile and not is_admin(x_admin_key):
+        raise HTTPException(
+            status_code=403,
+            detail="Profiling sob demanda restrito a administradores"
+        )
+    
     logger.info(
         "Recebida requisição de análise YLOS",
         filename=csv_file.filename,
@@ -44,15 +69,15 @@ async def analyze_trading_report(
     
     try:
         # Validar arquivo
-        if not csv_file.filename.endswith(('.csv', '.CSV')):
+        if not csv_file.filename.lower().endswith(ACCEPTED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail="Apenas arquivos CSV são aceitos"
+                detail="Apenas arquivos CSV (ou CSV compactado com gzip/zstd) são aceitos"
             )
         
-        # Verificar tamanho do arquivo
-        content = await csv_file.read()
-        if len(content) > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+        # Verificar tamanho do arquivo enviado (antes da descompressão)
+        tamanho_upload = upload_size(csv_file.file)
+        if tamanho_upload > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
             raise HTTPException(
                 status_code=400,
                 detail=f"Arquivo muito grande. Máximo: {settings.MAX_FILE_SIZE_MB}MB"
@@ -67,24 +92,52 @@ async def analyze_trading_report(
             saldo_atual=saldo_atual,
             fuso_horario=fuso_horario,
             verificar_noticias=verificar_noticias,
-            num_saques_realizados=num_saques_realizados
+            num_saques_realizados=num_saques_realizados,
+            conta_id=conta_id
         )
         
-        # Processar CSV
-        csv_content = content.decode('utf-8')
+        # Stream do CSV: a descompressão (gzip/zstd, por magic bytes) ocorre
+        # durante o parse, com limites de tamanho e taxa de compressão
+        upload = UploadStream(csv_file.file, tamanho_upload)
+        
+        # Executar análise (com profiling opcional)
+        trigger = profiling.select_trigger(admin_requested=profile)
+        profiler = profiling.AnalysisProfiler(trigger) if trigger else profiling.NullProfiler()
+        with profiler:
+            result = await analyzer.analyze_csv(upload.text, request_data, profiler=profiler)
         
-        # Executar análise
-        result = await analyzer.analyze_csv(csv_content, request_data)
+        profile_id = profiler.save({
+            'filename': csv_file.filename,
+            'tamanho_bytes': tamanho_upload,
+            'compressao': upload.compression,
+            'tamanho_descomprimido_bytes': upload.decompressed_bytes,
+            'conta_type': conta_type_enum.value,
+            'verificar_noticias': verificar_noticias,
+            'total_operacoes': result.total_operacoes,
+            'dias_operados': result.dias_operados,
+            'total_violacoes': len(result.violacoes),
+            'aprovado': result.aprovado
+        })
+        if profile_id:
+            response.headers["X-Profile-Id"] = profile_id
         
         logger.info(
             "Análise YLOS concluída com sucesso",
             filename=csv_file.filename,
+            compressao=upload.compression,
             aprovado=result.aprovado,
             total_violacoes=len(result.violacoes)
         )
         
+        # conta_id é informado pelo próprio cliente: detalhes de outras contas
+        # ficam restritos a administradores
+        if not is_admin(x_admin_key):
+            result = _without_copy_trade_details(result)
+        
         return result
         
+    except HTTPException:
+        raise
     except UnicodeDecodeError:
         logger.error("Erro de codificação no arquivo CSV")
         raise HTTPException(
@@ -101,6 +154,195 @@ async def analyze_trading_report(
             detail="Erro interno do servidor. Tente novamente."
         )
 
+def _without_copy_trade_details(result: YlosAnalysisResponse) -> YlosAnalysisResponse:
+    """Remove da resposta os ids e contagens de outras contas da detecção de cópia"""
+    violacoes = [
+        v.model_copy(update={'operacoes_afetadas': []}) if v.codigo == "YLOS_COPY_TRADE" else v
+        for v in result.violacoes
+    ]
+    return result.model_copy(update={
+        'contas_similares': None,
+        'cobertura_deteccao_copia': None,
+        'violacoes': violacoes
+    })
+
+def _archived_request(entry: dict, with_conta_id: bool = True, **overrides) -> YlosAnalysisRequest:
+    """Recria a requisição arquivada, aplicando os parâmetros informados"""
+    params = dict(entry['request'])
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    if with_conta_id and entry['conta_id'] != ANONYMOUS_ACCOUNT:
+        params.setdefault('conta_id', entry['conta_id'])
+    return YlosAnalysisRequest(**params)
+
+@router.get("/archive", dependencies=[Depends(require_admin)])
+async def list_archived_uploads(conta_id: Optional[str] = None):
+    """
+    Lista os uploads arquivados (admin)
+    
+    - **conta_id**: Filtra por conta
+    """
+    entries = TradeArchive().list_entries(conta_id)
+    return {"total": len(entries), "uploads": entries}
+
+@router.post(
+    "/archive/{conta_id}/{content_hash}/analyze",
+    response_model=YlosAnalysisResponse,
+    dependencies=[Depends(require_admin)]
+)
+async def reanalyze_archived_upload(
+    conta_id: str,
+    content_hash: str,
+    conta_type: Optional[int] = Form(None, description="Tipo da conta: 1=Master Funded, 2=Instant Funding"),
+    saldo_atual: Optional[float] = Form(None, description="Saldo atual em USD"),
+    fuso_horario: Optional[str] = Form(None, description="Fuso horário das operações"),
+    verificar_noticias: Optional[bool] = Form(None, description="Verificar conformidade com eventos noticiosos"),
+    num_saques_realizados: Optional[int] = Form(None, description="Número de saques já realizados"),
+    analyzer: YlosTradeAnalyzer = Depends(get_analyzer)
+):
+    """
+    Reanalisa um upload arquivado com as regras atuais, sem novo parse do CSV (admin)
+    
+    Parâmetros omitidos usam os valores da análise original. Durações são
+    recalculadas; números e datas mantêm a conversão feita no upload.
+    """
+    
+    if not analyzer.archive.available:
+        raise HTTPException(status_code=503, detail="Arquivo de uploads indisponível (pyarrow não instalado)")
+    
+    entry = analyzer.archive.get_entry(conta_id, content_hash)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Upload arquivado não encontrado")
+    
+    try:
+        conta_type_enum = None
+        if conta_type is not None:
+            conta_type_enum = ContaType.MASTER_FUNDED if conta_type == 1 else ContaType.INSTANT_FUNDING
+        
+        request_data = _archived_request(
+            entry,
+            conta_type=conta_type_enum,
+            saldo_atual=saldo_atual,
+            fuso_horario=fuso_horario,
+            verificar_noticias=verificar_noticias,
+            num_saques_realizados=num_saques_realizados
+        )
+        
+        # Reanálise de auditoria é somente leitura: não reindexa no índice de cópia
+        df = analyzer.load_archived(conta_id, content_hash)
+        result = await analyzer.analyze_dataframe(df, request_data, index_copy_trades=False)
+        
+        logger.info(
+            "Reanálise de upload arquivado concluída",
+            conta_id=conta_id,
+            content_hash=content_hash,
+            aprovado=result.aprovado
+        )
+        
+        return result
+        
+    except ValueError as e:
+        logger.error("Erro de validação", error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Erro interno na reanálise", error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor. Tente novamente."
+        )
+
+@router.post("/archive/reanalyze", dependencies=[Depends(require_admin)])
+async def bulk_reanalyze_archive(
+    body: ArchiveBulkReanalysisRequest,
+    analyzer: YlosTradeAnalyzer = Depends(get_analyzer)
+):
+    """
+    Reexecuta todo o arquivo com regras alteradas e mede o impacto (admin)
+    
+    Cada upload é analisado com as regras atuais e com as regras sobrescritas.
+    Verificação de notícias e detecção de cópia entre contas não são executadas.
+    """
+    
+    if not analyzer.archive.available:
+        raise HTTPException(status_code=503, detail="Arquivo de uploads indisponível (pyarrow não instalado)")
+    
+    try:
+        for conta_type in ContaType:
+            analyzer.get_rules(conta_type, body.regras)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Percorre o arquivo inteiro: fora do event loop para não bloquear outras requisições
+    return await run_in_threadpool(_bulk_reanalyze, analyzer, body)
+
+def _bulk_reanalyze(analyzer: YlosTradeAnalyzer, body: ArchiveBulkReanalysisRequest) -> dict:
+    """
+    Laço da reanálise em massa; roda em um thread do threadpool, com um event loop
+    próprio por análise (sem notícias, as análises não fazem I/O assíncrono)
+    """
+    analisados = 0
+    aprovados_antes = 0
+    aprovados_depois = 0
+    alterados = []
+    erros = []
+    
+    for entry in analyzer.archive.list_entries():
+        request_data = _archived_request(entry, with_conta_id=False, verificar_noticias=False)
+        if body.conta_type and request_data.conta_type != body.conta_type:
+            continue
+        
+        try:
+            df = analyzer.load_archived(entry['conta_id'], entry['content_hash'])
+            antes = asyncio.run(analyzer.analyze_dataframe(df.copy(), request_data))
+            depois = asyncio.run(analyzer.analyze_dataframe(df, request_data, rules_override=body.regras))
+        except Exception as e:
+            logger.error("Erro na reanálise em massa", conta_id=entry['conta_id'], error=str(e))
+            erros.append({"conta_id": entry['conta_id'], "content_hash": entry['content_hash'], "erro": str(e)})
+            continue
+        
+        analisados += 1
+        aprovados_antes += antes.aprovado
+        aprovados_depois += depois.aprovado
+        
+        codigos_antes = {v.codigo for v in antes.violacoes}
+        codigos_depois = {v.codigo for v in depois.violacoes}
+        if antes.aprovado != depois.aprovado or codigos_antes != codigos_depois:
+            alterados.append({
+                "conta_id": entry['conta_id'],
+                "content_hash": entry['content_hash'],
+                "aprovado_antes": antes.aprovado,
+                "aprovado_depois": depois.aprovado,
+                "violacoes_novas": sorted(codigos_depois - codigos_antes),
+                "violacoes_removidas": sorted(codigos_antes - codigos_depois)
+            })
+    
+    logger.info(
+        "Reanálise em massa concluída",
+        regras=body.regras,
+        analisados=analisados,
+        alterados=len(alterados)
+    )
+    
+    return {
+        "regras": body.regras,
+        "analisados": analisados,
+        "aprovados_antes": aprovados_antes,
+        "aprovados_depois": aprovados_depois,
+        "alterados": alterados,
+        "erros": erros
+    }
+
+@router.delete("/copy-trading/index", dependencies=[Depends(require_admin)])
+async def evict_copy_trading_index(dias: int = 90):
+    """
+    Remove do índice de cópia entre contas as janelas mais antigas que `dias`,
+    contados a partir da operação mais recente indexada (admin)
+    """
+    if dias < 0:
+        raise HTTPException(status_code=400, detail="dias deve ser >= 0")
+    
+    removidos = CopyTradeIndex().evict_older_than(dias)
+    return {"dias": dias, "registros_removidos": removidos}
+
 @router.get("/rules/{conta_type}")
 async def get_trading_rules(conta_type: str):
     """
@@ -131,7 +373,12 @@ async def get_trading_rules(conta_type: str):
             "consistencia_max_percent": "Máximo % que um dia pode representar do lucro total",
             "medios_max_por_operacao": "Máximo de médios permitidos por operação",
             "posicionamento_noticias": "Se é permitido estar posicionado durante notícias",
-            "overnight_trading": "Se é permitido trading overnight"
+            "overnight_trading": "Se é permitido trading overnight",
+            "drawdown_trailing_max": "Drawdown máximo em USD a partir do maior saldo atingido",
+            "perda_diaria_max": "Perda máxima em USD permitida em um único dia",
+            "contratos_max": "Máximo de contratos abertos simultaneamente por ativo",
+            "tempo_minimo_operacao_segundos": "Duração mínima em segundos para a operação não contar como scalping",
+            "proporcao_scalping_max": "Proporção máxima de operações abaixo do tempo mínimo"
         }
     }
 
@@ -0,0 +1,187 @@
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import numpy as np
+import pandas as pd
+import structlog
+from ..core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+SECONDS_PER_DAY = 86400
+
+# Deslocamentos de bucket consultados para tolerar atraso de cópia entre contas
+_NEIGHBOR_OFFSETS = [(d_open, d_close) for d_open in (-1, 0, 1) for d_close in (-1, 0, 1)]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    conta_id TEXT NOT NULL,
+    fingerprint INTEGER NOT NULL,
+    ocorrencia INTEGER NOT NULL,
+    janela INTEGER NOT NULL,
+    PRIMARY KEY (conta_id, fingerprint, ocorrencia)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_fingerprints_fingerprint ON fingerprints (fingerprint);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_janela ON fingerprints (janela);
+"""
+
+def _epoch_seconds(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+def _hash_fingerprints(base: pd.DataFrame, bucket_open: np.ndarray, bucket_close: np.ndarray) -> np.ndarray:
+    """Hash determinístico (ativo, lado, contratos, buckets de abertura/fechamento)"""
+    keyed = base.assign(bucket_abertura=bucket_open, bucket_fechamento=bucket_close)
+    return pd.util.hash_pandas_object(keyed, index=False).to_numpy().view(np.int64)
+
+class CopyTradeIndex:
+    """
+    Índice local (SQLite) de impressões digitais de operações, particionado em
+    janelas diárias, para detectar contas que espelham as mesmas operações.
+
+    A retenção é medida a partir da operação mais recente do índice (ou do upload),
+    não do relógio, para que históricos antigos também possam ser comparados.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.COPY_TRADE_INDEX_PATH)
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._schema_ready:
+            conn.executescript(_SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    def _fingerprint_frame(self, df: pd.DataFrame) -> Dict[str, Any]:
+        bucket_seconds = settings.COPY_TRADE_TIME_BUCKET_SECONDS
+        abertura = _epoch_seconds(df['Abertura'])
+        fechamento = _epoch_seconds(df['Fechamento'])
+
+        base = pd.DataFrame({
+            'ativo': df['Ativo'].astype(str).to_numpy(),
+            'lado': df['Lado'].astype(str).str.strip().str.upper().to_numpy(),
+            'contratos': np.maximum(
+                df['Qtd Compra'].fillna(0).to_numpy(dtype=np.int64),
+                df['Qtd Venda'].fillna(0).to_numpy(dtype=np.int64)
+            )
+        })
+        return {
+            'base': base,
+            'bucket_abertura': abertura // bucket_seconds,
+            'bucket_fechamento': fechamento // bucket_seconds,
+            'janela': abertura // SECONDS_PER_DAY
+        }
+
+    def index_and_match(self, df: pd.DataFrame, conta_id: str, index: bool = True) -> Dict[str, Any]:
+        """
+        Procura as operações da conta no índice de outras contas e depois as indexa
+        (com `index=False` apenas consulta, sem alterar nem expirar o índice).
+
+        Cada operação consulta 9 impressões (bucket vizinho de abertura e fechamento),
+        via índice do SQLite, então o custo por operação é praticamente constante.
+        """
+        if len(df) == 0:
+            return {'contas_similares': [], 'operacoes_comparadas': 0, 'operacoes_fora_da_janela': 0}
+
+        fp = self._fingerprint_frame(df)
+        own = _hash_fingerprints(fp['base'], fp['bucket_abertura'], fp['bucket_fechamento'])
+        # Operações idênticas na mesma conta são distinguidas pela ocorrência
+        ocorrencia = pd.Series(own).groupby(own).cumcount().to_numpy()
+
+        trade_idx = np.arange(len(df), dtype=np.int64)
+        consulta = np.concatenate([
+            _hash_fingerprints(fp['base'], fp['bucket_abertura'] + d_open, fp['bucket_fechamento'] + d_close)
+            for d_open, d_close in _NEIGHBOR_OFFSETS
+        ])
+        consulta_idx = np.tile(trade_idx, len(_NEIGHBOR_OFFSETS))
+
+        conn = self._connect()
+        try:
+            with conn:
+                cutoff = self._cutoff_window(conn, int(fp['janela'].max())) - settings.COPY_TRADE_RETENTION_DAYS
+                recentes = fp['janela'] >= cutoff
+                if index:
+                    conn.execute("DELETE FROM fingerprints WHERE janela < ?", (cutoff,))
+
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS consulta (idx INTEGER, fingerprint INTEGER)")
+                conn.execute("DELETE FROM consulta")
+                conn.executemany(
+                    "INSERT INTO consulta (idx, fingerprint) VALUES (?, ?)",
+                    zip(consulta_idx.tolist(), consulta.tolist())
+                )
+                matches = conn.execute(
+                    """
+                    SELECT m.conta_id, m.coincidentes_proprias, m.coincidentes_outra,
+                           (SELECT COUNT(*) FROM fingerprints t WHERE t.conta_id = m.conta_id)
+                    FROM (
+                        SELECT f.conta_id AS conta_id,
+                               COUNT(DISTINCT c.idx) AS coincidentes_proprias,
+                               COUNT(DISTINCT f.fingerprint || ':' || f.ocorrencia) AS coincidentes_outra
+                        FROM consulta c
+                        JOIN fingerprints f ON f.fingerprint = c.fingerprint
+                        WHERE f.conta_id != ?
+                        GROUP BY f.conta_id
+                    ) m
+                    """,
+                    (conta_id,)
+                ).fetchall()
+
+                if index:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO fingerprints (conta_id, fingerprint, ocorrencia, janela) VALUES (?, ?, ?, ?)",
+                        zip(
+                            [conta_id] * int(recentes.sum()),
+                            own[recentes].tolist(),
+                            ocorrencia[recentes].tolist(),
+                            fp['janela'][recentes].tolist()
+                        )
+                    )
+        finally:
+            conn.close()
+
+        # Pareamento aproximadamente 1:1: uma operação da outra conta não pode
+        # "cobrir" várias operações quase idênticas desta conta (e vice-versa)
+        total_operacoes = int(recentes.sum())
+        resultado = []
+        for outra_conta, proprias, da_outra, total_outra in matches:
+            coincidentes = min(proprias, da_outra)
+            # Normaliza pela maior conta: uma conta pequena não chega a 1.0 com uma operação
+            base_comparacao = max(total_operacoes, total_outra)
+            resultado.append({
+                'conta_id': outra_conta,
+                'operacoes_coincidentes': int(coincidentes),
+                'total_operacoes_outra_conta': int(total_outra),
+                'similaridade': round(min(coincidentes / base_comparacao, 1.0), 4) if base_comparacao else 0.0
+            })
+        resultado.sort(key=lambda m: m['similaridade'], reverse=True)
+
+        return {
+            'contas_similares': resultado,
+            'operacoes_comparadas': total_operacoes,
+            'operacoes_fora_da_janela': len(df) - total_operacoes
+        }
+
+    def evict_older_than(self, dias: int) -> int:
+        """
+        Remove janelas mais antigas que `dias` dias antes da operação mais recente
+        do índice; retorna registros removidos
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                cutoff = self._cutoff_window(conn) - dias
+                removidos = conn.execute("DELETE FROM fingerprints WHERE janela < ?", (cutoff,)).rowcount
+        finally:
+            conn.close()
+
+        logger.info("Janelas antigas removidas do índice de cópia", dias=dias, removidos=removidos)
+        return removidos
+
+    def _cutoff_window(self, conn: sqlite3.Connection, newest_upload_window: Optional[int] = None) -> int:
+        """Janela (dia) mais recente entre o índice e o upload atual"""
+        newest_indexed = conn.execute("SELECT MAX(janela) FROM fingerprints").fetchone()[0]
+        candidates = [w for w in (newest_indexed, newest_upload_window) if w is not None]
+        return max(candidates) if candidates else int(time.time()) // SECONDS_PER_DAY
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List
+
+# Ordem de processamento de eventos no mesmo instante: fechamentos liberam
+# contratos antes de novas aberturas; operações abertas e fechadas no mesmo
+# instante contam como posicionadas junto com as aberturas daquele instante.
+_ORDEM_FECHAMENTO = 0
+_ORDEM_ABERTURA = 1
+_ORDEM_FECHAMENTO_INSTANTANEO = 2
+
+def build_exposure_events(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte cada operação em um evento de abertura (+contratos) e um de
+    fechamento (-contratos), ordenados por instante para a varredura.
+    """
+    n = len(df)
+    contratos = np.maximum(
+        df['Qtd Compra'].fillna(0).to_numpy(dtype=np.int64),
+        df['Qtd Venda'].fillna(0).to_numpy(dtype=np.int64)
+    )
+    abertura = df['Abertura'].to_numpy(dtype='datetime64[ns]')
+    fechamento = df['Fechamento'].to_numpy(dtype='datetime64[ns]')
+    instantanea = fechamento <= abertura
+
+    momento = np.concatenate([abertura, fechamento])
+    ordem = np.concatenate([
+        np.full(n, _ORDEM_ABERTURA, dtype=np.int8),
+        np.where(instantanea, _ORDEM_FECHAMENTO_INSTANTANEO, _ORDEM_FECHAMENTO).astype(np.int8)
+    ])
+    sort_idx = np.lexsort((ordem, momento))
+
+    return pd.DataFrame({
+        'ativo': np.concatenate([df['Ativo'].to_numpy(), df['Ativo'].to_numpy()])[sort_idx],
+        'momento': momento[sort_idx],
+        'delta': np.concatenate([contratos, -contratos])[sort_idx]
+    })
+
+def _daily_peaks(events: pd.DataFrame, nivel: str, keys: List[str]) -> pd.DataFrame:
+    """
+    Pico diário de `nivel` por `keys`, considerando os contratos que chegam abertos
+    de dias anteriores: o pico do dia é no mínimo o nível herdado, e dias sem
+    eventos mas com posição aberta também são incluídos.
+    """
+    grouped = events.groupby(keys, sort=True)[nivel]
+    diario = pd.DataFrame({
+        'pico_eventos': grouped.max(),
+        'momento': events.loc[grouped.idxmax().to_numpy(), 'momento'].to_numpy(),
+        'nivel_final': grouped.last()
+    })
+
+    dias = pd.date_range(events['data'].min(), events['data'].max(), freq='D', name='data')
+    por_ativo = 'ativo' in keys
+    if por_ativo:
+        diario = diario.reindex(pd.MultiIndex.from_product(
+            [diario.index.get_level_values('ativo').unique(), dias], names=keys
+        ))
+        herdado = diario['nivel_final'].groupby(level='ativo').ffill()
+        herdado = herdado.groupby(level='ativo').shift(1)
+    else:
+        diario = diario.reindex(dias)
+        herdado = diario['nivel_final'].ffill().shift(1)
+    herdado = herdado.fillna(0).astype(np.int64)
+
+    tem_eventos = diario['pico_eventos'].notna()
+    pico_eventos = diario['pico_eventos'].fillna(0).astype(np.int64)
+    inicio_dia = pd.Series(diario.index.get_level_values('data'), index=diario.index)
+    diario['pico_contratos'] = np.maximum(pico_eventos, herdado)
+    # Quando o nível herdado domina, o pico ocorre desde a abertura do dia
+    diario['momento'] = diario['momento'].where(tem_eventos & (pico_eventos >= herdado), inicio_dia)
+
+    diario = diario[tem_eventos | (herdado > 0)]
+    return diario[['pico_contratos', 'momento']].reset_index()
+
+def compute_exposure(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Calcula a exposição simultânea máxima (contratos abertos) por ativo e por dia
+    com uma única varredura ordenada dos eventos, em O(n log n). Posições que
+    atravessam a virada do dia contam no pico de cada dia em que ficam abertas.
+    """
+    if len(df) == 0:
+        empty = pd.DataFrame(columns=['data', 'ativo', 'pico_contratos', 'momento'])
+        return {
+            'por_ativo': {},
+            'por_dia_ativo': empty,
+            'por_dia': pd.DataFrame(columns=['data', 'pico_contratos', 'momento']),
+            'pico_total': 0
+        }
+
+    events = build_exposure_events(df)
+
+    # Eventos já estão em ordem temporal: cumsum por grupo mantém essa ordem
+    events['aberto_ativo'] = events.groupby('ativo', sort=False)['delta'].cumsum()
+    events['aberto_total'] = events['delta'].cumsum()
+    events['data'] = events['momento'].dt.normalize()
+
+    por_dia_ativo = _daily_peaks(events, 'aberto_ativo', ['ativo', 'data'])[
+        ['data', 'ativo', 'pico_contratos', 'momento']
+    ].sort_values(['data', 'ativo'], ignore_index=True)
+    por_dia = _daily_peaks(events, 'aberto_total', ['data'])
+
+    por_ativo = por_dia_ativo.groupby('ativo')['pico_contratos'].max()
+
+    return {
+        'por_ativo': {str(k): int(v) for k, v in por_ativo.items()},
+        'por_dia_ativo': por_dia_ativo,
+        'por_dia': por_dia,
+        'pico_total': int(por_dia['pico_contratos'].max())
+    }
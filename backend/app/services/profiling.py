@@ -0,0 +1,224 @@
+import cProfile
+import json
+import pstats
+import random
+import re
+import shutil
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import structlog
+from ..core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+PROFILE_FILENAME = "profile.prof"
+METADATA_FILENAME = "metadata.json"
+TOP_FUNCTIONS_LIMIT = 30
+
+_PROFILE_ID_RE = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+# cProfile e tracemalloc são globais ao processo: apenas uma captura por vez
+_capture_lock = threading.Lock()
+
+def select_trigger(admin_requested: bool) -> Optional[str]:
+    """Decide se a requisição será capturada e por qual motivo"""
+    if admin_requested:
+        return "admin"
+    if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+class NullProfiler:
+    """Profiler inativo, usado quando a requisição não é capturada"""
+
+    active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def stage(self, name: str):
+        return nullcontext()
+
+    def save(self, metadata: Dict[str, Any]) -> Optional[str]:
+        return None
+
+class AnalysisProfiler:
+    """
+    Captura cProfile da análise e, em capturas de admin, estatísticas de alocação
+    por etapa (tracemalloc).
+
+    Capturas amostradas não usam tracemalloc, cujo custo distorceria a duração
+    comparada com PROFILING_SLOW_THRESHOLD_MS; resta apenas o overhead do cProfile.
+
+    Como o perfil é do thread do event loop, corrotinas concorrentes que rodarem
+    durante um await também aparecem na captura.
+    """
+
+    def __init__(self, trigger: str):
+        self.trigger = trigger
+        self.profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.active = False
+        self.stages: List[Dict[str, Any]] = []
+        self.duration_ms = 0.0
+        self.peak_bytes = 0
+        self.trace_allocations = trigger == "admin"
+        self._profile = cProfile.Profile()
+        self._started_at = 0.0
+        self._owns_tracemalloc = False
+
+    def __enter__(self):
+        if not _capture_lock.acquire(blocking=False):
+            logger.info("Captura de profiling já em andamento, ignorando", trigger=self.trigger)
+            return self
+
+        self.active = True
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._started_at = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.active:
+            return False
+
+        try:
+            self._profile.disable()
+            self.duration_ms = (time.perf_counter() - self._started_at) * 1000
+            if self.trace_allocations:
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak_bytes = max(self.peak_bytes, peak)
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        finally:
+            _capture_lock.release()
+        return False
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mede duração e (em capturas de admin) alocações de uma etapa da análise"""
+        if not self.active:
+            yield
+            return
+
+        if not self.trace_allocations:
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.stages.append({
+                    'etapa': name,
+                    'duracao_ms': round((time.perf_counter() - started) * 1000, 3)
+                })
+            return
+
+        _, peak_before = tracemalloc.get_traced_memory()
+        self.peak_bytes = max(self.peak_bytes, peak_before)
+        tracemalloc.reset_peak()
+        current_before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            current_after, peak = tracemalloc.get_traced_memory()
+            self.peak_bytes = max(self.peak_bytes, peak)
+            self.stages.append({
+                'etapa': name,
+                'duracao_ms': round((time.perf_counter() - started) * 1000, 3),
+                'alocado_liquido_bytes': current_after - current_before,
+                'pico_bytes': peak - current_before
+            })
+
+    def should_store(self) -> bool:
+        if not self.active:
+            return False
+        if self.trigger == "admin":
+            return True
+        return self.duration_ms >= settings.PROFILING_SLOW_THRESHOLD_MS
+
+    def save(self, metadata: Dict[str, Any]) -> Optional[str]:
+        """Persiste o perfil em disco se a captura deve ser mantida"""
+        if not self.should_store():
+            return None
+
+        try:
+            profile_dir = Path(settings.PROFILING_STORAGE_DIR) / self.profile_id
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            self._profile.dump_stats(str(profile_dir / PROFILE_FILENAME))
+
+            document = {
+                'profile_id': self.profile_id,
+                'trigger': self.trigger,
+                'criado_em': datetime.utcnow().isoformat(),
+                'duracao_ms': round(self.duration_ms, 3),
+                'pico_memoria_bytes': self.peak_bytes if self.trace_allocations else None,
+                'etapas': self.stages,
+                'requisicao': metadata,
+                'top_funcoes': self._top_functions()
+            }
+            with open(profile_dir / METADATA_FILENAME, 'w', encoding='utf-8') as f:
+                json.dump(document, f, ensure_ascii=False, indent=2, default=str)
+
+            _prune_old_profiles()
+        except OSError as e:
+            logger.error("Erro ao salvar profiling", profile_id=self.profile_id, error=str(e))
+            return None
+
+        logger.info(
+            "Profiling da análise salvo",
+            profile_id=self.profile_id,
+            trigger=self.trigger,
+            duracao_ms=round(self.duration_ms, 1)
+        )
+        return self.profile_id
+
+    def _top_functions(self) -> str:
+        buffer = StringIO()
+        stats = pstats.Stats(self._profile, stream=buffer)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS_LIMIT)
+        return buffer.getvalue()
+
+def _prune_old_profiles() -> None:
+    """Mantém apenas os PROFILING_MAX_STORED perfis mais recentes"""
+    profile_dirs = sorted(
+        (p for p in Path(settings.PROFILING_STORAGE_DIR).iterdir() if _PROFILE_ID_RE.match(p.name)),
+        key=lambda p: p.name
+    )
+    excess = len(profile_dirs) - settings.PROFILING_MAX_STORED
+    for old_dir in profile_dirs[:max(excess, 0)]:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Lista os perfis armazenados, do mais recente ao mais antigo"""
+    storage = Path(settings.PROFILING_STORAGE_DIR)
+    if not storage.is_dir():
+        return []
+
+    profiles = []
+    for profile_dir in sorted(storage.iterdir(), key=lambda p: p.name, reverse=True):
+        metadata_path = profile_dir / METADATA_FILENAME
+        if not _PROFILE_ID_RE.match(profile_dir.name) or not metadata_path.is_file():
+            continue
+        with open(metadata_path, encoding='utf-8') as f:
+            metadata = json.load(f)
+        metadata.pop('top_funcoes', None)
+        profiles.append(metadata)
+    return profiles
+
+def get_profile_dir(profile_id: str) -> Optional[Path]:
+    """Retorna o diretório do perfil, ou None se o id for inválido ou inexistente"""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    profile_dir = Path(settings.PROFILING_STORAGE_DIR) / profile_id
+    return profile_dir if profile_dir.is_dir() else None
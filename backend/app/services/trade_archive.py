@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import pandas as pd
+import structlog
+from ..core.config import settings
+from ..models.ylos_models import YlosAnalysisRequest
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # dependência opcional: sem pyarrow o arquivamento fica desabilitado
+    feather = None
+
+logger = structlog.get_logger(__name__)
+
+ANONYMOUS_ACCOUNT = "_sem_conta"
+DATA_SUFFIX = ".arrow"
+METADATA_SUFFIX = ".json"
+
+_CONTA_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_CONTENT_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Escritas do arquivo rodam fora do caminho da requisição, uma por vez; a fila é
+# limitada porque cada escrita pendente retém o DataFrame do upload em memória
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trade-archive")
+_pending_writes = threading.BoundedSemaphore(settings.ARCHIVE_MAX_PENDING_WRITES)
+
+def content_hash(df: pd.DataFrame) -> str:
+    """Hash SHA-256 do conteúdo processado (colunas + valores)"""
+    digest = hashlib.sha256()
+    digest.update("\t".join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+class TradeArchive:
+    """
+    Arquivo local de históricos processados em Arrow IPC (Feather v2), organizado
+    por conta e hash do conteúdo, para reanálise sem novo parse do CSV.
+
+    Com ARCHIVE_COMPRESSION="uncompressed" a leitura por memory-map é zero-copy;
+    com lz4 (padrão) os buffers são descomprimidos na leitura.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.ARCHIVE_DIR)
+
+    @property
+    def available(self) -> bool:
+        return feather is not None
+
+    def _paths(self, conta_id: str, digest: str):
+        base = self.root / conta_id / digest
+        return base.with_suffix(DATA_SUFFIX), base.with_suffix(METADATA_SUFFIX)
+
+    def store_in_background(self, df: pd.DataFrame, request: YlosAnalysisRequest) -> Optional[Future]:
+        """
+        Agenda `store` no thread de escrita; falhas são apenas registradas em log.
+        Com ARCHIVE_MAX_PENDING_WRITES escritas na fila o upload não é arquivado.
+        """
+        if not _pending_writes.acquire(blocking=False):
+            logger.warning(
+                "Fila de arquivamento cheia, upload não arquivado",
+                conta_id=request.conta_id,
+                total_operacoes=len(df)
+            )
+            return None
+
+        try:
+            future = _writer.submit(self.store, df, request)
+        except BaseException:
+            _pending_writes.release()
+            raise
+        future.add_done_callback(lambda f: self._write_done(f, request))
+        return future
+
+    @staticmethod
+    def _write_done(future: Future, request: YlosAnalysisRequest) -> None:
+        _pending_writes.release()
+        error = future.exception()
+        if error is not None:
+            logger.error("Erro ao arquivar operações", conta_id=request.conta_id, error=str(error))
+
+    def store(self, df: pd.DataFrame, request: YlosAnalysisRequest) -> str:
+        """Arquiva as operações processadas; uploads idênticos são gravados uma única vez"""
+        if not self.available:
+            raise RuntimeError("pyarrow não instalado; arquivamento indisponível")
+
+        conta_id = request.conta_id or ANONYMOUS_ACCOUNT
+        digest = content_hash(df)
+        data_path, metadata_path = self._paths(conta_id, digest)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not data_path.exists():
+            tmp_path = data_path.with_suffix(DATA_SUFFIX + ".tmp")
+            feather.write_feather(df, tmp_path, compression=settings.ARCHIVE_COMPRESSION)
+            os.replace(tmp_path, data_path)
+
+        # Parâmetros da análise mais recente, usados como padrão na reanálise
+        metadata = {
+            'conta_id': conta_id,
+            'content_hash': digest,
+            'arquivado_em': datetime.utcnow().isoformat(),
+            'total_operacoes': len(df),
+            'tamanho_bytes': data_path.stat().st_size,
+            'request': request.model_dump(mode='json', exclude={'conta_id'})
+        }
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        if conta_id == ANONYMOUS_ACCOUNT:
+            self._prune_account(conta_id, settings.ARCHIVE_ANONYMOUS_MAX_STORED)
+
+        logger.info("Operações arquivadas", conta_id=conta_id, content_hash=digest, total_operacoes=len(df))
+        return digest
+
+    def _prune_account(self, conta_id: str, max_stored: int) -> None:
+        """Mantém apenas os `max_stored` uploads mais recentes da conta"""
+        metadata_paths = sorted(
+            (self.root / conta_id).glob(f"*{METADATA_SUFFIX}"),
+            key=lambda p: p.stat().st_mtime
+        )
+        for metadata_path in metadata_paths[:max(len(metadata_paths) - max_stored, 0)]:
+            metadata_path.with_suffix(DATA_SUFFIX).unlink(missing_ok=True)
+            metadata_path.unlink(missing_ok=True)
+
+    def load(self, conta_id: str, digest: str) -> pd.DataFrame:
+        """Carrega as operações arquivadas via memory-map do arquivo Arrow"""
+        if not self.available:
+            raise RuntimeError("pyarrow não instalado; arquivamento indisponível")
+
+        data_path, _ = self._paths(conta_id, digest)
+        table = feather.read_table(data_path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    def get_entry(self, conta_id: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Metadados de um upload arquivado, ou None se inexistente/inválido"""
+        if not _CONTA_ID_RE.match(conta_id) or not _CONTENT_HASH_RE.match(digest):
+            return None
+
+        data_path, metadata_path = self._paths(conta_id, digest)
+        if not data_path.is_file() or not metadata_path.is_file():
+            return None
+        with open(metadata_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_entries(self, conta_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lista uploads arquivados, opcionalmente de uma única conta"""
+        if not self.root.is_dir():
+            return []
+        if conta_id is not None and not _CONTA_ID_RE.match(conta_id):
+            return []
+
+        account_dirs = [self.root / conta_id] if conta_id else sorted(self.root.iterdir())
+        entries = []
+        for account_dir in account_dirs:
+            if not account_dir.is_dir():
+                continue
+            for metadata_path in sorted(account_dir.glob(f"*{METADATA_SUFFIX}")):
+                entry = self.get_entry(account_dir.name, metadata_path.stem)
+                if entry:
+                    entries.append(entry)
+        return entries
@@ -0,0 +1,144 @@
+import gzip
+import io
+import zlib
+from typing import BinaryIO, Optional
+from ..core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # dependência opcional: uploads .zst ficam indisponíveis
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+ACCEPTED_EXTENSIONS = ('.csv', '.csv.gz', '.gz', '.csv.zst', '.zst')
+
+class DecompressionLimitError(ValueError):
+    """Conteúdo descomprimido excede o tamanho ou a taxa de compressão permitidos"""
+
+class CorruptedUploadError(ValueError):
+    """Arquivo compactado truncado ou inválido"""
+
+# Erros dos descompressores que indicam arquivo enviado corrompido/truncado
+_GZIP_ERRORS = (EOFError, OSError, zlib.error)
+_ZSTD_ERRORS = (zstandard.ZstdError,) if zstandard is not None else ()
+
+def detect_compression(header: bytes) -> Optional[str]:
+    """Detecta a compressão pelos magic bytes do início do arquivo"""
+    if header.startswith(GZIP_MAGIC):
+        return "gzip"
+    if header.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+def upload_size(fileobj: BinaryIO) -> int:
+    """Tamanho do upload (já em spool no servidor) sem lê-lo para memória"""
+    fileobj.seek(0, io.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+class _ZstdFrameReader:
+    """
+    Descomprime frames zstd sob demanda e, ao fim do arquivo, exige que o último
+    frame tenha sido concluído: o `stream_reader` do zstandard trata um frame
+    truncado como EOF normal e devolveria dados parciais.
+    """
+
+    _CHUNK_SIZE = 128 * 1024
+
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self._dctx = zstandard.ZstdDecompressor()
+        self._dobj = self._dctx.decompressobj()
+        self._frame_started = False
+        self._pending = b""
+        self._offset = 0
+
+    def read(self, size: int) -> bytes:
+        while self._offset >= len(self._pending):
+            chunk = self._fileobj.read(self._CHUNK_SIZE)
+            if not chunk:
+                if self._frame_started and not self._dobj.eof:
+                    raise CorruptedUploadError("Arquivo compactado incompleto: frame zstd truncado")
+                return b""
+
+            output = []
+            while chunk:
+                if self._dobj.eof:
+                    # Próximo frame concatenado no mesmo arquivo
+                    self._dobj = self._dctx.decompressobj()
+                self._frame_started = True
+                output.append(self._dobj.decompress(chunk))
+                chunk = self._dobj.unused_data if self._dobj.eof else b""
+            self._pending, self._offset = b"".join(output), 0
+
+        data = self._pending[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+class _LimitedReader(io.RawIOBase):
+    """Conta bytes lidos do stream e interrompe a leitura ao exceder o limite"""
+
+    def __init__(self, raw, limit: Optional[int], limit_message: str = "", decode_errors: tuple = ()):
+        self._raw = raw
+        self._limit = limit
+        self._limit_message = limit_message
+        self._decode_errors = decode_errors
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        try:
+            data = self._raw.read(len(buffer))
+        except self._decode_errors as e:
+            raise CorruptedUploadError(f"Arquivo compactado inválido ou incompleto: {e}") from e
+        n = len(data)
+        buffer[:n] = data
+        self.bytes_read += n
+        if self._limit is not None and self.bytes_read > self._limit:
+            raise DecompressionLimitError(self._limit_message)
+        return n
+
+class UploadStream:
+    """Stream de texto UTF-8 do CSV enviado, descomprimido sob demanda"""
+
+    def __init__(self, fileobj: BinaryIO, compressed_size: int):
+        header = fileobj.read(4)
+        fileobj.seek(0)
+
+        self.compression = detect_compression(header)
+        self.compressed_size = compressed_size
+
+        decode_errors = ()
+        if self.compression == "gzip":
+            raw = gzip.GzipFile(fileobj=fileobj, mode='rb')
+            decode_errors = _GZIP_ERRORS
+        elif self.compression == "zstd":
+            if zstandard is None:
+                raise ValueError("Arquivos compactados com zstd não são suportados neste servidor")
+            raw = _ZstdFrameReader(fileobj)
+            decode_errors = _ZSTD_ERRORS
+        else:
+            raw = fileobj
+
+        limit, message = None, ""
+        if self.compression:
+            max_decompressed = settings.MAX_DECOMPRESSED_SIZE_MB * 1024 * 1024
+            max_by_ratio = settings.MAX_COMPRESSION_RATIO * compressed_size
+            if max_by_ratio < max_decompressed:
+                limit = max_by_ratio
+                message = f"Taxa de compressão acima do permitido. Máximo: {settings.MAX_COMPRESSION_RATIO}x"
+            else:
+                limit = max_decompressed
+                message = f"Arquivo descomprimido muito grande. Máximo: {settings.MAX_DECOMPRESSED_SIZE_MB}MB"
+
+        self._reader = _LimitedReader(raw, limit, message, decode_errors)
+        self.text = io.TextIOWrapper(io.BufferedReader(self._reader), encoding='utf-8')
+
+    @property
+    def decompressed_bytes(self) -> int:
+        return self._reader.bytes_read
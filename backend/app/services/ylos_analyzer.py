@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 import pytz
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, TextIO, Union
 import structlog
 import requests
 from ..models.ylos_models import (
@@ -12,13 +14,33 @@ from ..models.ylos_models import (
     ContaType
 )
 from ..core.config import settings
+from .profiling import NullProfiler
+from .exposure import compute_exposure
+from .copy_trading import CopyTradeIndex
+from .trade_archive import TradeArchive
 
 logger = structlog.get_logger(__name__)
 
+# Colunas numéricas exportadas em formato brasileiro (ex: "5.990,25")
+NUMERIC_COLUMNS = [
+    'Qtd Compra', 'Qtd Venda', 'Preço Compra', 'Preço Venda', 'Preço de Mercado',
+    'Res. Intervalo', 'Res. Intervalo (%)', 'Res. Operação', 'Res. Operação (%)', 'Total'
+]
+
+# Durações exportadas como "1h20min59s", "39min53s", "36s"
+DURATION_COLUMNS = {'Tempo Operação': 'Tempo Operação (s)', 'TET': 'TET (s)'}
+DURATION_PATTERN = r'^\s*(?:(\d+)h)?\s*(?:(\d+)min)?\s*(?:(\d+)s)?\s*$'
+
+# Tolerância do cruzamento duração x (Fechamento - Abertura), que tem resolução de minuto
+DURATION_TOLERANCE_SECONDS = 60
+
 class YlosTradeAnalyzer:
     """Analisador enterprise para regras da YLOS Trading"""
     
     def __init__(self):
+        self.copy_trade_index = CopyTradeIndex()
+        self.archive = TradeArchive()
+        
         self.timezone_map = {
             '-03': 'America/Sao_Paulo',  # BRT
             '-04': 'America/New_York',   # NY com DST  
@@ -35,7 +57,12 @@ class YlosTradeAnalyzer:
             'consistencia_max_percent': 40.0,
             'medios_max_por_operacao': 3,
             'posicionamento_noticias': False,
-            'overnight_trading': False
+            'overnight_trading': False,
+            'drawdown_trailing_max': 2500.0,
+            'perda_diaria_max': 1250.0,
+            'contratos_max': 10,
+            'tempo_minimo_operacao_segundos': 60,
+            'proporcao_scalping_max': 0.5
         }
         
         self.rules_instant_funding = {
@@ -45,16 +72,54 @@ class YlosTradeAnalyzer:
             'consistencia_max_percent': 30.0,
             'medios_max_por_operacao': 3,
             'posicionamento_noticias': False,
-            'overnight_trading': False
+            'overnight_trading': False,
+            'drawdown_trailing_max': 2000.0,
+            'perda_diaria_max': 1000.0,
+            'contratos_max': 5,
+            'tempo_minimo_operacao_segundos': 60,
+            'proporcao_scalping_max': 0.3
         }
     
     async def analyze_csv(
         self, 
-        csv_content: str, 
-        request: YlosAnalysisRequest
+        csv_content: Union[str, TextIO], 
+        request: YlosAnalysisRequest,
+        profiler: Optional[Any] = None
     ) -> YlosAnalysisResponse:
         """Analisa o CSV de operações conforme regras YLOS"""
         
+        profiler = profiler or NullProfiler()
+        
+        try:
+            # Processar CSV
+            with profiler.stage("process_csv"):
+                df = self._process_csv(csv_content)
+            
+            # Arquivar operações processadas para reanálise sem novo parse
+            with profiler.stage("archive"):
+                self._archive_upload(df, request)
+        except Exception as e:
+            logger.error("Erro no processamento do CSV YLOS", error=str(e))
+            raise
+        
+        return await self.analyze_dataframe(df, request, profiler=profiler)
+    
+    async def analyze_dataframe(
+        self,
+        df: pd.DataFrame,
+        request: YlosAnalysisRequest,
+        profiler: Optional[Any] = None,
+        rules_override: Optional[Dict[str, Any]] = None,
+        index_copy_trades: bool = True
+    ) -> YlosAnalysisResponse:
+        """
+        Executa as regras YLOS sobre operações já processadas (CSV ou arquivo)
+        
+        Com `index_copy_trades=False` a detecção de cópia só consulta o índice.
+        """
+        
+        profiler = profiler or NullProfiler()
+        
         logger.info(
             "Iniciando análise YLOS",
             conta_type=request.conta_type,
@@ -63,41 +128,63 @@ class YlosTradeAnalyzer:
         )
         
         try:
-            # Processar CSV
-            df = self._process_csv(csv_content)
-            
             # Selecionar regras baseadas no tipo de conta
-            rules = (self.rules_master_funded 
-                    if request.conta_type == ContaType.MASTER_FUNDED 
-                    else self.rules_instant_funding)
+            rules = self.get_rules(request.conta_type, rules_override)
             
             # Executar análises
             violacoes = []
             
             # 1. Análise de dias operados e vencedores
-            dias_analysis = self._analyze_trading_days(df, rules)
+            with profiler.stage("trading_days"):
+                dias_analysis = self._analyze_trading_days(df, rules)
             violacoes.extend(dias_analysis['violacoes'])
             
             # 2. Análise de consistência (regra dos 40% ou 30%)
-            consistencia_analysis = self._analyze_consistency(df, rules)
+            with profiler.stage("consistency"):
+                consistencia_analysis = self._analyze_consistency(df, rules)
             violacoes.extend(consistencia_analysis['violacoes'])
             
             # 3. Análise de estratégia de médio
-            medios_analysis = self._analyze_averaging_strategy(df, rules)
+            with profiler.stage("averaging_strategy"):
+                medios_analysis = self._analyze_averaging_strategy(df, rules)
             violacoes.extend(medios_analysis['violacoes'])
             
             # 4. Análise de notícias (se solicitado)
             noticias_analysis = None
             if request.verificar_noticias:
-                noticias_analysis = await self._analyze_news_compliance(
-                    df, request.fuso_horario
-                )
+                with profiler.stage("news_compliance"):
+                    noticias_analysis = await self._analyze_news_compliance(
+                        df, request.fuso_horario
+                    )
                 violacoes.extend(noticias_analysis['violacoes'])
             
             # 5. Verificar overnight trading
-            overnight_analysis = self._analyze_overnight_trading(df)
+            with profiler.stage("overnight_trading"):
+                overnight_analysis = self._analyze_overnight_trading(df)
             violacoes.extend(overnight_analysis['violacoes'])
             
+            # 6. Drawdown trailing e perda diária sobre a curva de saldo
+            with profiler.stage("drawdown"):
+                drawdown_analysis = self._analyze_drawdown(df, request.saldo_atual, rules)
+            violacoes.extend(drawdown_analysis['violacoes'])
+            
+            # 7. Exposição simultânea máxima (limite de contratos)
+            with profiler.stage("exposure"):
+                exposicao_analysis = self._analyze_exposure(df, rules)
+            violacoes.extend(exposicao_analysis['violacoes'])
+            
+            # 8. Tempo mínimo de operação e proporção de scalping
+            with profiler.stage("holding_time"):
+                tempo_analysis = self._analyze_holding_time(df, rules)
+            violacoes.extend(tempo_analysis['violacoes'])
+            
+            # 9. Cópia de operações entre contas (requer conta_id)
+            copia_analysis = None
+            if request.conta_id:
+                with profiler.stage("copy_trading"):
+                    copia_analysis = self._analyze_copy_trading(df, request.conta_id, index_copy_trades)
+                violacoes.extend(copia_analysis['violacoes'])
+            
             # Determinar se está aprovado
             critical_violations = [v for v in violacoes if v.severidade == "CRITICAL"]
             aprovado = len(critical_violations) == 0
@@ -114,6 +201,12 @@ class YlosTradeAnalyzer:
                 lucro_total=df['Total'].sum(),
                 maior_lucro_dia=dias_analysis['maior_lucro_dia'],
                 consistencia_40_percent=consistencia_analysis['passou_consistencia'],
+                saldo_inicial_estimado=drawdown_analysis['saldo_inicial'],
+                drawdown_maximo=drawdown_analysis['drawdown_maximo'],
+                exposicao_maxima=exposicao_analysis['exposicao'],
+                estatisticas_tempo_operacao=tempo_analysis['estatisticas'],
+                contas_similares=copia_analysis['contas_similares'] if copia_analysis else None,
+                cobertura_deteccao_copia=copia_analysis['cobertura'] if copia_analysis else None,
                 violacoes=violacoes,
                 detalhes_noticias=noticias_analysis['detalhes'] if noticias_analysis else None,
                 recomendacoes=recomendacoes,
@@ -133,19 +226,91 @@ class YlosTradeAnalyzer:
             logger.error("Erro na análise YLOS", error=str(e))
             raise
     
-    def _process_csv(self, csv_content: str) -> pd.DataFrame:
-        """Processa o conteúdo CSV e retorna DataFrame limpo"""
+    def get_rules(
+        self,
+        conta_type: ContaType,
+        rules_override: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Regras do tipo de conta, opcionalmente com valores sobrescritos"""
+        rules = (self.rules_master_funded 
+                if conta_type == ContaType.MASTER_FUNDED 
+                else self.rules_instant_funding)
+        
+        if not rules_override:
+            return rules
+        
+        unknown = sorted(set(rules_override) - set(rules))
+        if unknown:
+            raise ValueError(f"Regras desconhecidas: {unknown}")
+        return {**rules, **rules_override}
+    
+    def _archive_upload(self, df: pd.DataFrame, request: YlosAnalysisRequest) -> Optional[Future]:
+        """
+        Agenda o arquivamento do upload fora do caminho da requisição.
+        
+        Colunas derivadas (durações em segundos) não são arquivadas: `load_archived`
+        as recalcula, para que a reanálise use o parser atual. Números e datas já
+        ficam arquivados convertidos.
+        """
+        if not settings.ARCHIVE_ENABLED or not self.archive.available:
+            return None
+        
+        # drop gera um novo DataFrame: as regras adicionam colunas ao df durante a escrita em background
+        derived = [c for c in DURATION_COLUMNS.values() if c in df.columns]
+        return self.archive.store_in_background(df.drop(columns=derived), request)
+    
+    def load_archived(self, conta_id: str, digest: str) -> pd.DataFrame:
+        """Carrega um upload arquivado e recalcula as colunas derivadas"""
+        df = self.archive.load(conta_id, digest)
+        self._add_duration_columns(df)
+        return df
+    
+    def _process_csv(self, csv_content: Union[str, TextIO]) -> pd.DataFrame:
+        """Processa o conteúdo CSV (texto ou stream) e retorna DataFrame limpo"""
         from io import StringIO
         
-        # Ler CSV
-        df = pd.read_csv(StringIO(csv_content), sep='\t')
+        # Ler CSV (streams são consumidos direto pelo parser)
+        source = StringIO(csv_content) if isinstance(csv_content, str) else csv_content
+        # Colunas numéricas são lidas como texto: com pontos de milhar e sem vírgula
+        # ("1.250") o pandas inferiria float 1.25
+        df = pd.read_csv(source, sep='\t', dtype={column: str for column in NUMERIC_COLUMNS})
         
         # Converter tipos
         df['Abertura'] = pd.to_datetime(df['Abertura'], format='%d/%m/%Y %H:%M')
         df['Fechamento'] = pd.to_datetime(df['Fechamento'], format='%d/%m/%Y %H:%M')
         
+        for column in NUMERIC_COLUMNS:
+            if column in df.columns:
+                df[column] = self._parse_br_number(df[column])
+        
+        self._add_duration_columns(df)
+        
         return df
     
+    def _add_duration_columns(self, df: pd.DataFrame) -> None:
+        """Adiciona as durações em segundos a partir das colunas de texto"""
+        for column, seconds_column in DURATION_COLUMNS.items():
+            if column in df.columns:
+                df[seconds_column] = self._parse_duration_seconds(df[column])
+    
+    @staticmethod
+    def _parse_duration_seconds(series: pd.Series) -> pd.Series:
+        """Converte durações ("1h20min59s") em segundos; valores fora do formato viram NA"""
+        parts = series.astype(str).str.extract(DURATION_PATTERN).astype('float64')
+        seconds = (parts[0].fillna(0) * 3600
+                   + parts[1].fillna(0) * 60
+                   + parts[2].fillna(0))
+        return seconds.where(parts.notna().any(axis=1)).astype('Int64')
+    
+    @staticmethod
+    def _parse_br_number(series: pd.Series) -> pd.Series:
+        """Converte números no formato brasileiro ("5.990,25") para float"""
+        normalized = (series.astype(str)
+                      .str.strip()
+                      .str.replace('.', '', regex=False)
+                      .str.replace(',', '.', regex=False))
+        return pd.to_numeric(normalized, errors='coerce')
+    
     def _analyze_trading_days(self, df: pd.DataFrame, rules: Dict) -> Dict[str, Any]:
         """Analisa dias operados e dias vencedores"""
         violacoes = []
@@ -342,6 +507,247 @@ class YlosTradeAnalyzer:
         
         return {'violacoes': violacoes}
     
+    def _analyze_drawdown(self, df: pd.DataFrame, saldo_atual: float, rules: Dict) -> Dict[str, Any]:
+        """
+        Reconstrói a curva de saldo por ordem de fechamento, ancorada no saldo atual,
+        e verifica drawdown trailing e perda diária com operações cumulativas.
+        
+        Atingir o limite (drawdown ou perda diária) já conta como violação. A perda
+        diária agrupa por data de Fechamento, quando o resultado é realizado; as
+        regras de dias operados usam Abertura, e só divergem em operações overnight,
+        já reportadas por YLOS_OVERNIGHT.
+        """
+        violacoes = []
+        
+        if len(df) == 0:
+            return {'violacoes': violacoes, 'saldo_inicial': saldo_atual, 'drawdown_maximo': 0.0}
+        
+        ordered = df
+        if not df['Fechamento'].is_monotonic_increasing:
+            ordered = df.sort_values('Fechamento', kind='mergesort')
+        
+        pnl = ordered['Res. Operação'].fillna(0).to_numpy(dtype=np.float64)
+        resultado_acumulado = np.cumsum(pnl)
+        
+        # O saldo atual é o ponto final da curva
+        saldo_inicial = saldo_atual - resultado_acumulado[-1]
+        saldo = saldo_inicial + resultado_acumulado
+        pico = np.maximum(np.maximum.accumulate(saldo), saldo_inicial)
+        drawdown = pico - saldo
+        
+        # Drawdown trailing: primeira operação que ultrapassa o limite
+        limite_drawdown = rules['drawdown_trailing_max']
+        breach_mask = drawdown >= limite_drawdown
+        if breach_mask.any():
+            idx = int(np.argmax(breach_mask))
+            op = ordered.iloc[idx]
+            violacoes.append(ViolacaoRegra(
+                codigo="YLOS_DRAWDOWN",
+                titulo="Drawdown Trailing Excedido",
+                descricao=f"Drawdown de {drawdown[idx]:.2f} a partir do pico de {pico[idx]:.2f}, máximo permitido: {limite_drawdown}",
+                severidade="CRITICAL",
+                operacoes_afetadas=[{
+                    'ativo': op['Ativo'],
+                    'abertura': str(op['Abertura']),
+                    'fechamento': str(op['Fechamento']),
+                    'resultado': float(pnl[idx]),
+                    'saldo': float(saldo[idx]),
+                    'pico': float(pico[idx]),
+                    'drawdown': float(drawdown[idx])
+                }],
+                valor_impacto=float(drawdown[idx])
+            ))
+        
+        # Perda diária: resultado acumulado desde a abertura de cada dia
+        dias = ordered['Fechamento'].dt.normalize().to_numpy()
+        inicio_dia = np.flatnonzero(np.r_[True, dias[1:] != dias[:-1]])
+        acumulado_antes_do_dia = np.r_[0.0, resultado_acumulado][inicio_dia]
+        resultado_no_dia = resultado_acumulado - np.repeat(
+            acumulado_antes_do_dia, np.diff(np.r_[inicio_dia, len(pnl)])
+        )
+        
+        limite_perda_diaria = rules['perda_diaria_max']
+        breach_idx = np.flatnonzero(resultado_no_dia <= -limite_perda_diaria)
+        if len(breach_idx) > 0:
+            # Primeira operação que rompe o limite em cada dia
+            dia_de_cada_breach = np.searchsorted(inicio_dia, breach_idx, side='right')
+            _, primeira = np.unique(dia_de_cada_breach, return_index=True)
+            for idx in breach_idx[primeira]:
+                op = ordered.iloc[idx]
+                violacoes.append(ViolacaoRegra(
+                    codigo="YLOS_PERDA_DIARIA",
+                    titulo="Limite de Perda Diária Excedido",
+                    descricao=f"Perda de {-resultado_no_dia[idx]:.2f} em {op['Fechamento'].date()}, máximo permitido: {limite_perda_diaria}",
+                    severidade="CRITICAL",
+                    operacoes_afetadas=[{
+                        'ativo': op['Ativo'],
+                        'abertura': str(op['Abertura']),
+                        'fechamento': str(op['Fechamento']),
+                        'resultado': float(pnl[idx]),
+                        'resultado_dia': float(resultado_no_dia[idx]),
+                        'saldo': float(saldo[idx])
+                    }],
+                    valor_impacto=float(-resultado_no_dia[idx])
+                ))
+        
+        return {
+            'violacoes': violacoes,
+            'saldo_inicial': float(saldo_inicial),
+            'drawdown_maximo': float(drawdown.max())
+        }
+    
+    def _analyze_exposure(self, df: pd.DataFrame, rules: Dict) -> Dict[str, Any]:
+        """Analisa contratos abertos simultaneamente por ativo e por dia"""
+        violacoes = []
+        
+        exposure = compute_exposure(df)
+        por_dia_ativo = exposure['por_dia_ativo']
+        limite = rules['contratos_max']
+        
+        excedidos = por_dia_ativo[por_dia_ativo['pico_contratos'] > limite]
+        if len(excedidos) > 0:
+            violacoes.append(ViolacaoRegra(
+                codigo="YLOS_CONTRATOS",
+                titulo="Limite de Contratos Simultâneos Excedido",
+                descricao=f"Exposição de até {int(excedidos['pico_contratos'].max())} contratos simultâneos em {len(excedidos)} dia(s)/ativo(s), máximo permitido: {limite}",
+                severidade="CRITICAL",
+                operacoes_afetadas=[{
+                    'data': str(row.data.date()),
+                    'ativo': row.ativo,
+                    'pico_contratos': int(row.pico_contratos),
+                    'momento': str(row.momento)
+                } for row in excedidos.itertuples(index=False)]
+            ))
+        
+        return {
+            'violacoes': violacoes,
+            'exposicao': {
+                'pico_total': exposure['pico_total'],
+                'por_ativo': exposure['por_ativo'],
+                'por_dia': [{
+                    'data': str(row.data.date()),
+                    'pico_contratos': int(row.pico_contratos),
+                    'momento': str(row.momento)
+                } for row in exposure['por_dia'].itertuples(index=False)]
+            }
+        }
+    
+    def _analyze_holding_time(self, df: pd.DataFrame, rules: Dict) -> Dict[str, Any]:
+        """
+        Analisa tempo de permanência das operações (tempo mínimo e proporção de
+        scalping), reportado como estatísticas agrupadas por ativo.
+        """
+        violacoes = []
+        
+        if len(df) == 0:
+            return {'violacoes': violacoes, 'estatisticas': None}
+        
+        duracao_calculada = (df['Fechamento'] - df['Abertura']).dt.total_seconds()
+        if 'Tempo Operação (s)' in df.columns:
+            duracao_informada = df['Tempo Operação (s)'].astype('float64')
+        else:
+            duracao_informada = pd.Series(np.nan, index=df.index)
+        
+        inconsistentes = int(
+            ((duracao_informada - duracao_calculada).abs() >= DURATION_TOLERANCE_SECONDS).sum()
+        )
+        duracao = duracao_informada.fillna(duracao_calculada)
+        
+        tempo_minimo = rules['tempo_minimo_operacao_segundos']
+        stats = pd.DataFrame({
+            'ativo': df['Ativo'],
+            'duracao': duracao,
+            'abaixo_minimo': duracao < tempo_minimo
+        }).groupby('ativo').agg(
+            operacoes=('duracao', 'size'),
+            abaixo_minimo=('abaixo_minimo', 'sum'),
+            mediana_segundos=('duracao', 'median'),
+            minimo_segundos=('duracao', 'min')
+        )
+        stats['proporcao_scalping'] = stats['abaixo_minimo'] / stats['operacoes']
+        
+        por_ativo = [{
+            'ativo': str(ativo),
+            'operacoes': int(row.operacoes),
+            'abaixo_minimo': int(row.abaixo_minimo),
+            'proporcao_scalping': round(float(row.proporcao_scalping), 4),
+            'mediana_segundos': float(row.mediana_segundos),
+            'minimo_segundos': float(row.minimo_segundos)
+        } for ativo, row in stats.iterrows()]
+        
+        total_abaixo = int(stats['abaixo_minimo'].sum())
+        proporcao_scalping = total_abaixo / len(df)
+        estatisticas = {
+            'tempo_minimo_segundos': tempo_minimo,
+            'operacoes_abaixo_minimo': total_abaixo,
+            'proporcao_scalping': round(proporcao_scalping, 4),
+            'mediana_segundos': float(duracao.median()),
+            'mediana_tet_segundos': float(df['TET (s)'].median()) if 'TET (s)' in df.columns and df['TET (s)'].notna().any() else None,
+            'duracoes_inconsistentes': inconsistentes,
+            'por_ativo': por_ativo
+        }
+        
+        limite = rules['proporcao_scalping_max']
+        if proporcao_scalping > limite:
+            violacoes.append(ViolacaoRegra(
+                codigo="YLOS_SCALPING",
+                titulo="Proporção de Scalping Acima do Permitido",
+                descricao=f"{proporcao_scalping:.1%} das operações duraram menos de {tempo_minimo}s, máximo permitido: {limite:.0%}",
+                severidade="CRITICAL",
+                operacoes_afetadas=[a for a in por_ativo if a['abaixo_minimo'] > 0]
+            ))
+        
+        if inconsistentes > 0:
+            violacoes.append(ViolacaoRegra(
+                codigo="YLOS_TEMPO_INCONSISTENTE",
+                titulo="Tempo de Operação Inconsistente",
+                descricao=f"{inconsistentes} operação(ões) com 'Tempo Operação' divergente de Fechamento - Abertura",
+                severidade="WARNING"
+            ))
+        
+        return {'violacoes': violacoes, 'estatisticas': estatisticas}
+    
+    def _analyze_copy_trading(self, df: pd.DataFrame, conta_id: str, index: bool = True) -> Dict[str, Any]:
+        """Analisa se outras contas espelham as operações desta conta"""
+        violacoes = []
+        
+        try:
+            deteccao = self.copy_trade_index.index_and_match(df, conta_id, index=index)
+        except Exception as e:
+            logger.error("Erro na detecção de cópia entre contas", conta_id=conta_id, error=str(e))
+            return {'violacoes': [], 'contas_similares': None, 'cobertura': None}
+        
+        contas_similares = deteccao['contas_similares']
+        cobertura = {
+            'operacoes_comparadas': deteccao['operacoes_comparadas'],
+            'operacoes_fora_da_janela': deteccao['operacoes_fora_da_janela'],
+            'retencao_dias': settings.COPY_TRADE_RETENTION_DAYS
+        }
+        
+        suspeitas = [
+            c for c in contas_similares
+            if c['similaridade'] >= settings.COPY_TRADE_SIMILARITY_THRESHOLD
+            and c['operacoes_coincidentes'] >= settings.COPY_TRADE_MIN_MATCHES
+        ]
+        if suspeitas:
+            violacoes.append(ViolacaoRegra(
+                codigo="YLOS_COPY_TRADE",
+                titulo="Possível Cópia de Operações Entre Contas",
+                descricao=f"{len(suspeitas)} conta(s) com operações coincidentes acima de {settings.COPY_TRADE_SIMILARITY_THRESHOLD:.0%} de similaridade",
+                severidade="WARNING",
+                operacoes_afetadas=suspeitas
+            ))
+        
+        if deteccao['operacoes_fora_da_janela'] > 0:
+            violacoes.append(ViolacaoRegra(
+                codigo="YLOS_COPY_TRADE_JANELA",
+                titulo="Detecção de Cópia Parcial",
+                descricao=f"{deteccao['operacoes_fora_da_janela']} operação(ões) fora da janela de {settings.COPY_TRADE_RETENTION_DAYS} dias do índice não foram comparadas com outras contas",
+                severidade="WARNING"
+            ))
+        
+        return {'violacoes': violacoes, 'contas_similares': contas_similares, 'cobertura': cobertura}
+    
     def _generate_recommendations(self, violacoes: List[ViolacaoRegra], dias_analysis: Dict) -> List[str]:
         """Gera recomendações baseadas nas violações encontradas"""
         recomendacoes = []
@@ -363,6 +769,21 @@ class YlosTradeAnalyzer:
         if "YLOS_OVERNIGHT" in violation_codes:
             recomendacoes.append("Feche todas as posições antes do final do dia de trading")
         
+        if "YLOS_DRAWDOWN" in violation_codes:
+            recomendacoes.append("Reduza o tamanho das posições para manter o drawdown dentro do limite trailing")
+        
+        if "YLOS_PERDA_DIARIA" in violation_codes:
+            recomendacoes.append("Defina um stop diário abaixo do limite de perda diária da conta")
+        
+        if "YLOS_SCALPING" in violation_codes:
+            recomendacoes.append("Mantenha as posições abertas por mais tempo que o mínimo do plano na maioria das operações")
+        
+        if "YLOS_COPY_TRADE" in violation_codes:
+            recomendacoes.append("Operações coincidentes com outras contas serão revisadas antes da aprovação do saque")
+        
+        if "YLOS_CONTRATOS" in violation_codes:
+            recomendacoes.append("Limite a soma de contratos em posições abertas ao mesmo tempo ao máximo do plano")
+        
         if not recomendacoes:
             recomendacoes.append("Parabéns! Suas operações estão em conformidade com as regras da YLOS")
         
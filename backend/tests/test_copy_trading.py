@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from app.services.copy_trading import CopyTradeIndex
+
+def _trades(n, inicio="2025-06-04 10:00", fim="2025-06-04 10:05"):
+    return pd.DataFrame({
+        'Ativo': ['ESFUT'] * n,
+        'Lado': ['C'] * n,
+        'Qtd Compra': [1] * n,
+        'Qtd Venda': [1] * n,
+        'Abertura': pd.to_datetime([inicio] * n),
+        'Fechamento': pd.to_datetime([fim] * n)
+    })
+
+@pytest.fixture
+def index(tmp_path):
+    return CopyTradeIndex(str(tmp_path / "index.sqlite3"))
+
+def test_old_history_is_indexed_relative_to_its_own_dates(index):
+    index.index_and_match(_trades(3), "A")
+    result = index.index_and_match(_trades(3), "B")
+
+    assert result['operacoes_fora_da_janela'] == 0
+    assert result['contas_similares'][0]['conta_id'] == "A"
+    assert result['contas_similares'][0]['similaridade'] == 1.0
+
+def test_one_trade_does_not_match_many_near_identical_trades(index):
+    index.index_and_match(_trades(1), "B")
+    result = index.index_and_match(_trades(20), "A")
+
+    match = result['contas_similares'][0]
+    assert match['operacoes_coincidentes'] == 1
+    assert match['similaridade'] == 0.05
+
+def test_trades_outside_retention_window_are_reported(index, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "COPY_TRADE_RETENTION_DAYS", 30)
+    index.index_and_match(_trades(2, "2025-06-04 10:00", "2025-06-04 10:05"), "A")
+
+    result = index.index_and_match(_trades(2, "2025-01-02 10:00", "2025-01-02 10:05"), "B")
+
+    assert result['operacoes_fora_da_janela'] == 2
+    assert result['operacoes_comparadas'] == 0
+
+def test_public_response_hides_other_accounts():
+    from app.models.ylos_models import YlosAnalysisResponse, ViolacaoRegra
+    from app.routers.ylos_analysis import _without_copy_trade_details
+    suspeita = {'conta_id': "VITIMA", 'operacoes_coincidentes': 10, 'total_operacoes_outra_conta': 10, 'similaridade': 1.0}
+    result = YlosAnalysisResponse(
+        aprovado=True, total_operacoes=10, dias_operados=1, dias_vencedores=1,
+        lucro_total=0.0, maior_lucro_dia=0.0, consistencia_40_percent=True,
+        contas_similares=[suspeita],
+        cobertura_deteccao_copia={'operacoes_comparadas': 10},
+        violacoes=[ViolacaoRegra(
+            codigo="YLOS_COPY_TRADE", titulo="", descricao="", severidade="WARNING", operacoes_afetadas=[suspeita]
+        )]
+    )
+
+    public = _without_copy_trade_details(result)
+
+    assert "VITIMA" not in public.model_dump_json()
+    assert public.violacoes[0].codigo == "YLOS_COPY_TRADE"
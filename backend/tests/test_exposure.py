@@ -0,0 +1,62 @@
+import pandas as pd
+from app.services.exposure import compute_exposure
+
+def _trades(rows):
+    """rows: (ativo, abertura, fechamento, contratos)"""
+    return pd.DataFrame({
+        'Ativo': [r[0] for r in rows],
+        'Abertura': pd.to_datetime([r[1] for r in rows]),
+        'Fechamento': pd.to_datetime([r[2] for r in rows]),
+        'Qtd Compra': [r[3] for r in rows],
+        'Qtd Venda': [r[3] for r in rows]
+    })
+
+def _peaks(frame):
+    return {str(row.data.date()): int(row.pico_contratos) for row in frame.itertuples(index=False)}
+
+def test_overlapping_trades_add_up():
+    result = compute_exposure(_trades([
+        ("WINFUT", "2025-06-04 10:00", "2025-06-04 10:30", 3),
+        ("WINFUT", "2025-06-04 10:10", "2025-06-04 10:20", 2),
+        ("WINFUT", "2025-06-04 11:00", "2025-06-04 11:10", 4)
+    ]))
+
+    assert result['por_ativo'] == {"WINFUT": 5}
+    assert result['pico_total'] == 5
+
+def test_close_is_processed_before_open_at_the_same_instant():
+    result = compute_exposure(_trades([
+        ("WINFUT", "2025-06-04 10:00", "2025-06-04 10:30", 3),
+        ("WINFUT", "2025-06-04 10:30", "2025-06-04 10:40", 3)
+    ]))
+
+    assert result['pico_total'] == 3
+
+def test_zero_duration_trade_counts_with_opens_at_that_instant():
+    result = compute_exposure(_trades([
+        ("WINFUT", "2025-06-04 10:00", "2025-06-04 10:00", 2),
+        ("WINFUT", "2025-06-04 10:00", "2025-06-04 10:05", 3)
+    ]))
+
+    assert result['pico_total'] == 5
+
+def test_multiple_assets_are_tracked_separately():
+    result = compute_exposure(_trades([
+        ("WINFUT", "2025-06-04 10:00", "2025-06-04 10:30", 3),
+        ("WDOFUT", "2025-06-04 10:10", "2025-06-04 10:20", 2)
+    ]))
+
+    assert result['por_ativo'] == {"WINFUT": 3, "WDOFUT": 2}
+    assert result['pico_total'] == 5
+    assert len(result['por_dia_ativo']) == 2
+
+def test_positions_carried_overnight_count_on_every_day_they_are_open():
+    result = compute_exposure(_trades([
+        ("WINFUT", "2025-06-02 16:00", "2025-06-04 10:00", 20),
+        ("WINFUT", "2025-06-04 11:00", "2025-06-04 11:10", 1)
+    ]))
+
+    assert _peaks(result['por_dia_ativo']) == {"2025-06-02": 20, "2025-06-03": 20, "2025-06-04": 20}
+    assert _peaks(result['por_dia']) == {"2025-06-02": 20, "2025-06-03": 20, "2025-06-04": 20}
+    momento_0603 = result['por_dia'].set_index('data').loc[pd.Timestamp("2025-06-03"), 'momento']
+    assert momento_0603 == pd.Timestamp("2025-06-03")
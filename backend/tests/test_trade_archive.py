@@ -0,0 +1,84 @@
+import asyncio
+import sqlite3
+import pandas as pd
+import pytest
+from app.core.config import settings
+from app.models.ylos_models import YlosAnalysisRequest, ContaType
+from app.services.copy_trading import CopyTradeIndex
+from app.services.trade_archive import TradeArchive, ANONYMOUS_ACCOUNT
+from app.services.ylos_analyzer import YlosTradeAnalyzer
+
+pytest.importorskip("pyarrow")
+
+CSV = "\n".join([
+    "Ativo\tAbertura\tFechamento\tQtd Compra\tQtd Venda\tLado\tMédio\tRes. Operação\tTotal",
+    "ESFUT\t04/06/2025 06:41\t04/06/2025 07:21\t3\t3\tV\tNão\t337,5\t337,5",
+    "ESFUT\t04/06/2025 08:45\t04/06/2025 09:15\t4\t4\tV\tSim\t150\t487,5",
+])
+
+def _request(conta_id=None):
+    return YlosAnalysisRequest(
+        conta_type=ContaType.MASTER_FUNDED,
+        saldo_atual=50000.0,
+        fuso_horario="-03",
+        num_saques_realizados=0,
+        conta_id=conta_id
+    )
+
+def test_store_and_load_roundtrip(tmp_path):
+    archive = TradeArchive(str(tmp_path))
+    df = YlosTradeAnalyzer()._process_csv(CSV)
+
+    digest = archive.store(df, _request("acc1"))
+
+    loaded = archive.load("acc1", digest)
+    pd.testing.assert_frame_equal(loaded, df, check_dtype=False)
+    assert archive.get_entry("acc1", digest)['total_operacoes'] == 2
+
+def test_anonymous_uploads_are_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_ANONYMOUS_MAX_STORED", 2)
+    archive = TradeArchive(str(tmp_path))
+    df = YlosTradeAnalyzer()._process_csv(CSV)
+
+    for saldo in (1.0, 2.0, 3.0):
+        archive.store(df.assign(Total=saldo), _request())
+
+    assert len(archive.list_entries(ANONYMOUS_ACCOUNT)) == 2
+
+def test_reanalysis_does_not_write_copy_trade_index(tmp_path):
+    analyzer = YlosTradeAnalyzer()
+    analyzer.copy_trade_index = CopyTradeIndex(str(tmp_path / "index.sqlite3"))
+    df = analyzer._process_csv(CSV)
+
+    asyncio.run(analyzer.analyze_dataframe(df, _request("acc1"), index_copy_trades=False))
+
+    with sqlite3.connect(tmp_path / "index.sqlite3") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0] == 0
+
+def test_derived_duration_columns_are_recomputed_on_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_ENABLED", True)
+    analyzer = YlosTradeAnalyzer()
+    analyzer.archive = TradeArchive(str(tmp_path))
+    df = analyzer._process_csv("\n".join([
+        "Ativo\tAbertura\tFechamento\tQtd Compra\tQtd Venda\tTotal\tTempo Operação",
+        "ESFUT\t04/06/2025 06:41\t04/06/2025 07:21\t3\t3\t337,5\t40min",
+    ]))
+
+    digest = analyzer._archive_upload(df, _request("acc1")).result()
+
+    assert 'Tempo Operação (s)' not in analyzer.archive.load("acc1", digest).columns
+    assert analyzer.load_archived("acc1", digest)['Tempo Operação (s)'].tolist() == [2400]
+
+def test_upload_is_skipped_when_write_queue_is_full(tmp_path, monkeypatch):
+    from app.services import trade_archive
+    monkeypatch.setattr(trade_archive, "_pending_writes", trade_archive.threading.BoundedSemaphore(1))
+    archive = TradeArchive(str(tmp_path))
+    df = YlosTradeAnalyzer()._process_csv(CSV)
+
+    trade_archive._pending_writes.acquire()
+    try:
+        assert archive.store_in_background(df, _request("acc1")) is None
+    finally:
+        trade_archive._pending_writes.release()
+
+    assert archive.store_in_background(df, _request("acc1")).result()
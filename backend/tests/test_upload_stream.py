@@ -0,0 +1,52 @@
+import gzip
+import io
+import pytest
+from app.services.upload_stream import UploadStream, CorruptedUploadError, DecompressionLimitError
+
+CSV = "Ativo\tAbertura\n" + "ESFUT\t04/06/2025 06:41\n" * 200
+
+def _stream(data: bytes) -> UploadStream:
+    return UploadStream(io.BytesIO(data), len(data))
+
+def test_gzip_upload_is_decompressed():
+    upload = _stream(gzip.compress(CSV.encode('utf-8')))
+
+    assert upload.compression == "gzip"
+    assert upload.text.read() == CSV
+
+def test_truncated_gzip_raises_value_error():
+    data = gzip.compress(CSV.encode('utf-8'))
+
+    with pytest.raises(CorruptedUploadError):
+        _stream(data[:len(data) // 2]).text.read()
+
+def test_invalid_zstd_frame_raises_value_error():
+    zstandard = pytest.importorskip("zstandard")
+    data = zstandard.ZstdCompressor().compress(CSV.encode('utf-8'))
+    corrupted = data[:8] + b'\x00' * (len(data) - 8)
+
+    with pytest.raises(CorruptedUploadError):
+        _stream(corrupted).text.read()
+
+def test_compression_ratio_limit(monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "MAX_COMPRESSION_RATIO", 2)
+
+    with pytest.raises(DecompressionLimitError):
+        _stream(gzip.compress(CSV.encode('utf-8'))).text.read()
+
+def test_truncated_multi_block_zstd_raises_value_error():
+    zstandard = pytest.importorskip("zstandard")
+    rows = "".join(f"ESFUT\t04/06/2025 06:41\t{i}\n" for i in range(100_000))
+    data = zstandard.ZstdCompressor().compress(("Ativo\tAbertura\tId\n" + rows).encode('utf-8'))
+
+    with pytest.raises(CorruptedUploadError):
+        _stream(data[:len(data) // 2]).text.read()
+
+def test_concatenated_zstd_frames_are_decompressed():
+    zstandard = pytest.importorskip("zstandard")
+    cctx = zstandard.ZstdCompressor()
+    half = len(CSV) // 2
+    data = cctx.compress(CSV[:half].encode('utf-8')) + cctx.compress(CSV[half:].encode('utf-8'))
+
+    assert _stream(data).text.read() == CSV
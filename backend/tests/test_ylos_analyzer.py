@@ -0,0 +1,108 @@
+import asyncio
+import pandas as pd
+import pytest
+from app.core.config import settings
+from app.services.ylos_analyzer import YlosTradeAnalyzer
+from app.models.ylos_models import YlosAnalysisRequest, ContaType
+
+HEADER = "Ativo\tAbertura\tFechamento\tQtd Compra\tQtd Venda\tLado\tMédio\tRes. Operação\tTotal"
+
+@pytest.fixture(autouse=True)
+def _no_archive(monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_ENABLED", False)
+
+def _csv(rows, header=HEADER):
+    return "\n".join([header] + ["\t".join(row) for row in rows])
+
+def _holding_time(rows):
+    """rows: (abertura, fechamento, tempo_operacao)"""
+    analyzer = YlosTradeAnalyzer()
+    df = analyzer._process_csv(_csv(
+        [("WINFUT", abertura, fechamento, "1", "1", "C", "Não", "10", "10", tempo)
+         for abertura, fechamento, tempo in rows],
+        header=HEADER + "\tTempo Operação"
+    ))
+    return analyzer._analyze_holding_time(df, analyzer.rules_master_funded)
+
+def _request(saldo_atual=50000.0):
+    return YlosAnalysisRequest(
+        conta_type=ContaType.MASTER_FUNDED,
+        saldo_atual=saldo_atual,
+        fuso_horario="-03",
+        num_saques_realizados=0
+    )
+
+def test_process_csv_parses_dot_grouped_integers():
+    """Coluna só com milhares ("1.250", sem vírgula) não pode virar 1.25"""
+    df = YlosTradeAnalyzer()._process_csv(_csv([
+        ("WINFUT", "02/06/2025 09:00", "02/06/2025 09:10", "1", "1", "C", "Não", "1.250", "1.250"),
+        ("WINFUT", "02/06/2025 10:00", "02/06/2025 10:10", "1", "1", "V", "Não", "-2.000", "-750"),
+        ("WINFUT", "02/06/2025 11:00", "02/06/2025 11:10", "1", "1", "C", "Não", "300", "-450"),
+    ]))
+
+    assert df['Res. Operação'].tolist() == [1250.0, -2000.0, 300.0]
+    assert df['Total'].tolist() == [1250.0, -750.0, -450.0]
+
+def test_daily_loss_breach_with_dot_grouped_values():
+    analyzer = YlosTradeAnalyzer()
+    csv = _csv([
+        ("WINFUT", "02/06/2025 09:00", "02/06/2025 09:10", "1", "1", "C", "Não", "-1.250", "-1.250"),
+    ])
+
+    result = asyncio.run(analyzer.analyze_csv(csv, _request()))
+
+    codigos = {v.codigo for v in result.violacoes}
+    assert "YLOS_PERDA_DIARIA" in codigos
+    assert "YLOS_DRAWDOWN" not in codigos
+    assert result.drawdown_maximo == 1250.0
+
+def test_drawdown_equal_to_limit_is_breach():
+    analyzer = YlosTradeAnalyzer()
+    limite = analyzer.rules_master_funded['drawdown_trailing_max']
+    csv = _csv([
+        ("WINFUT", "02/06/2025 09:00", "02/06/2025 09:10", "1", "1", "C", "Não", "1.000", "1.000"),
+        ("WINFUT", "03/06/2025 09:00", "03/06/2025 09:10", "1", "1", "V", "Não", "-1.000", "0"),
+        ("WINFUT", "04/06/2025 09:00", "04/06/2025 09:10", "1", "1", "V", "Não", "-1.000", "-1.000"),
+        ("WINFUT", "05/06/2025 09:00", "05/06/2025 09:10", "1", "1", "V", "Não", "-500", "-1.500"),
+    ])
+
+    result = asyncio.run(analyzer.analyze_csv(csv, _request()))
+
+    assert result.drawdown_maximo == limite
+    assert "YLOS_DRAWDOWN" in {v.codigo for v in result.violacoes}
+
+def test_parse_duration_seconds():
+    parsed = YlosTradeAnalyzer._parse_duration_seconds(pd.Series(["1h20min59s", "36s", " - "]))
+
+    assert parsed.tolist()[:2] == [4859, 36]
+    assert parsed.isna().tolist() == [False, False, True]
+
+def test_duration_cross_check_tolerates_less_than_60_seconds():
+    result = _holding_time([
+        ("02/06/2025 09:00", "02/06/2025 09:10", "10min59s"),
+        ("02/06/2025 10:00", "02/06/2025 10:10", "11min"),
+    ])
+
+    assert result['estatisticas']['duracoes_inconsistentes'] == 1
+    assert "YLOS_TEMPO_INCONSISTENTE" in {v.codigo for v in result['violacoes']}
+
+def test_scalping_proportion_at_limit_is_allowed():
+    # Master Funded: proporcao_scalping_max = 0.5
+    result = _holding_time([
+        ("02/06/2025 09:00", "02/06/2025 09:00", "30s"),
+        ("02/06/2025 10:00", "02/06/2025 10:10", "10min"),
+    ])
+
+    assert result['estatisticas']['proporcao_scalping'] == 0.5
+    assert "YLOS_SCALPING" not in {v.codigo for v in result['violacoes']}
+
+def test_scalping_proportion_above_limit_is_critical():
+    result = _holding_time([
+        ("02/06/2025 09:00", "02/06/2025 09:00", "30s"),
+        ("02/06/2025 09:30", "02/06/2025 09:30", "45s"),
+        ("02/06/2025 10:00", "02/06/2025 10:10", "10min"),
+    ])
+
+    scalping = [v for v in result['violacoes'] if v.codigo == "YLOS_SCALPING"]
+    assert len(scalping) == 1
+    assert scalping[0].severidade == "CRITICAL"